@@ -1,5 +1,10 @@
 import math
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+import numpy as np
 
 TEST_INPUT_01 = "L68 L30 R48 L5 R60 L55 L1 L99 R14 L82"
 TEST_INPUT_02 = "L68 L30 R48 L5 R60 L55 L1 L99 R14 L82 R1000"
@@ -60,13 +65,159 @@ def second(input: str | Path):
             count += zero_hits
             current = new_pos % 100
 
-        print(
-            f"The dial is rotated {rotation} to point at {current}; during this rotation, it passed 0 {zero_hits} times"
-        )
+        # print(
+        #     f"The dial is rotated {rotation} to point at {current}; during this rotation, it passed 0 {zero_hits} times"
+        # )
 
     return count
 
 
+# rotations straight from the bytes of the file, read in fixed size chunks so that
+# memory does not depend on the size of the file. left rotations are negative.
+# start and stop restrict it to a byte range, which has to begin and end at a line break.
+def stream_rotations(
+    path: Path, chunk_size: int = 1 << 20, start: int = 0, stop: int | None = None
+) -> Iterator[int]:
+    rest = b""
+    with path.open("rb") as f:
+        f.seek(start)
+        remaining = math.inf if stop is None else stop - start
+        while remaining > 0 and (chunk := f.read(min(chunk_size, remaining))):
+            remaining -= len(chunk)
+            tokens = (rest + chunk).split()
+            # the last token might continue in the next chunk
+            rest = b"" if chunk[-1:].isspace() else tokens.pop()
+            for token in tokens:
+                yield -int(token[1:]) if token[0] == ord("L") else int(token[1:])
+
+    if rest:
+        yield -int(rest[1:]) if rest[0] == ord("L") else int(rest[1:])
+
+
+# both counts in one go: how often the dial ends on 0 (first) and how often it passes
+# 0 (second), plus the position it ends on
+def fold_rotations(rotations: Iterable[int], current: int = 50) -> tuple[int, int, int]:
+    landings = 0
+    crossings = 0
+    for rotation in rotations:
+        if rotation < 0:
+            crossings += ((100 - current) % 100 - rotation) // 100
+        else:
+            crossings += (current + rotation) // 100
+
+        current = (current + rotation) % 100
+        if current == 0:
+            landings += 1
+
+    return landings, crossings, current
+
+
+def stream_counts(path: Path) -> tuple[int, int]:
+    landings, crossings, _ = fold_rotations(stream_rotations(path))
+    return landings, crossings
+
+
+# signed rotations as one array, left rotations are negative. with L turned into a minus
+# sign and R dropped, numpy can parse the whole text in one call.
+def rotation_array(input: str | Path) -> np.ndarray:
+    if isinstance(input, Path):
+        input = input.read_text()
+    text = input.replace("L", "-").replace("R", "")
+    return np.fromstring(text, dtype=np.int64, sep=" ")
+
+
+def first_np(input: str | Path) -> int:
+    positions = 50 + np.cumsum(rotation_array(input))
+    return int(np.count_nonzero(positions % 100 == 0))
+
+
+def second_np(input: str | Path) -> int:
+    rotations = rotation_array(input)
+    # unwrapped positions after and before every rotation
+    after = 50 + np.cumsum(rotations)
+    before = after - rotations
+
+    # right: multiples of 100 in (before, after], left: in [after, before)
+    right = after // 100 - before // 100
+    left = (before - 1) // 100 - (after - 1) // 100
+    return int(np.where(rotations < 0, left, right).sum())
+
+
+# the result of a part of the rotations for all 100 possible start positions:
+# the net offset, and the landings and crossings per start position.
+# a rotation from unwrapped position a to b passes the multiples of 100 in (a, b] when
+# going right and in [b, a) when going left, so it counts
+#   floor((s + b) / 100) - floor((s + a) / 100)  resp.  floor((s + a - 1) / 100) - ...
+# for a start position s. each of these floors is x // 100 plus one if s >= 100 - x % 100,
+# so every rotation only adds a constant and two steps over s.
+def chunk_summary(
+    path: Path, start: int = 0, stop: int | None = None
+) -> tuple[int, list[int], list[int]]:
+    residues = [0] * 100  # how often the part ends a rotation on each offset (mod 100)
+    base = 0
+    steps = [0] * 101
+
+    def add_floor(x: int, sign: int):
+        nonlocal base
+        base += sign * (x // 100)
+        steps[100 - x % 100] += sign
+
+    offset = 0
+    for rotation in stream_rotations(path, start=start, stop=stop):
+        new_offset = offset + rotation
+        if rotation < 0:
+            add_floor(offset - 1, 1)
+            add_floor(new_offset - 1, -1)
+        else:
+            add_floor(new_offset, 1)
+            add_floor(offset, -1)
+        offset = new_offset
+        residues[offset % 100] += 1
+
+    # landing on 0 from start s means s + offset is a multiple of 100
+    landings = [residues[-s % 100] for s in range(100)]
+    crossings = []
+    step = base
+    for s in range(100):
+        step += steps[s]
+        crossings.append(step)
+
+    return offset, landings, crossings
+
+
+# byte offsets that split the file into about `parts` pieces, each on a line break
+def chunk_offsets(path: Path, parts: int) -> list[int]:
+    size = path.stat().st_size
+    offsets = [0]
+    with path.open("rb") as f:
+        for part in range(1, parts):
+            f.seek(max(size * part // parts, offsets[-1]))
+            f.readline()  # move on to the start of the next line
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+    return sorted(set(offsets))
+
+
+# the summaries of all chunks are computed in parallel, then composed in order
+def parallel_counts(
+    path: Path, workers: int | None = None, parts: int | None = None
+) -> tuple[int, int]:
+    workers = workers or os.cpu_count() or 1
+    offsets = chunk_offsets(path, parts or 4 * workers)
+
+    with ProcessPoolExecutor(workers) as pool:
+        summaries = pool.map(chunk_summary, repeat(path), offsets[:-1], offsets[1:])
+
+        current = 50
+        landings, crossings = 0, 0
+        for offset, chunk_landings, chunk_crossings in summaries:
+            landings += chunk_landings[current]
+            crossings += chunk_crossings[current]
+            current = (current + offset) % 100
+
+    return landings, crossings
+
+
 if __name__ == "__main__":
     ### first challenge
     print("Starting FIRST challenge")
@@ -84,3 +235,23 @@ if __name__ == "__main__":
 
     prod_result = second(Path("./days/01/input/first"))
     print(f"Result of Prod: {prod_result}")  # solution is 6695
+
+    ### streaming, both at once
+    streamed = stream_counts(Path("./days/01/input/first"))
+    print(f"Result of Prod (streamed): {streamed}")
+    assert streamed == (first(Path("./days/01/input/first")), prod_result)
+
+    ### vectorised
+    assert first_np(TEST_INPUT_01) == 3
+    assert second_np(TEST_INPUT_02) == 16
+    vectorised = (
+        first_np(Path("./days/01/input/first")),
+        second_np(Path("./days/01/input/first")),
+    )
+    print(f"Result of Prod (numpy): {vectorised}")
+    assert vectorised == streamed
+
+    ### parallel prefix scan, both at once
+    parallel = parallel_counts(Path("./days/01/input/first"))
+    print(f"Result of Prod (parallel): {parallel}")
+    assert parallel == streamed
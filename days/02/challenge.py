@@ -1,4 +1,9 @@
 from pathlib import Path
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from itertools import accumulate
+from tempfile import TemporaryDirectory
 import math
 
 TEST_FIRST = "11-22,95-115,998-1012,1188511880-1188511890,222220-222224,1698522-1698528,446443-446449,38593856-38593862,565653-565659,824824821-824824827,2121212118-2121212124"
@@ -15,19 +20,27 @@ def parse_input(input: str | Path) -> list[tuple[int, int]]:
     return ranges
 
 
+# sorted and disjoint ranges, overlapping (or touching) ones are merged into one.
+# every id is then in at most one range, so nothing has to be deduplicated later.
+def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
 def first_slow(input: str | Path):
-    ranges = parse_input(input)
+    ranges = merge_ranges(parse_input(input))
 
-    checked: list[int] = []
     invalid: list[int] = []
     for start, end in ranges:
         print(f"Checking range {start}-{end}")
 
         for i in range(start, end + 1):
-            if i in checked:
-                continue
-            checked.append(i)
-
             str_i = str(i)
             str_i_len = len(str_i)
             if str_i_len % 2 != 0:
@@ -39,33 +52,29 @@ def first_slow(input: str | Path):
     return sum(invalid)
 
 
-def first(input: str | Path) -> int:
-    ranges = parse_input(input)
+# the "doubled" ids of a range, e.g. 6464, built from their first half
+def doubled_ids(start: int, end: int) -> Iterator[int]:
+    if len(str(start)) % 2 != 0:
+        start = 10 ** len(str(start))
 
-    invalid: set[int] = set()
-    for start, end in ranges:
-        print(f"Checking range {start}-{end}")
-
-        if len(str(start)) % 2 != 0:
-            start = 10 ** len(str(start))
+    start_str = str(start)
+    current = int(start_str[: math.ceil(len(start_str) / 2)])
+    if int(f"{current}{current}") < start:
+        current += 1
 
-        start_str = str(start)
-        current = int(start_str[: math.ceil(len(start_str) / 2)])
-        if int(f"{current}{current}") < start:
-            current += 1
+    while (res := int(f"{current}{current}")) <= end:
+        current += 1
+        yield res
 
-        while (res := int(f"{current}{current}")) <= end:
-            # print(f"Adding {res} in range {start}-{end}")
-            current += 1
-            invalid.add(res)
 
-    return sum(invalid)
+def first(input: str | Path) -> int:
+    return total_invalid(parse_input(input), doubled_only=True)
 
 
-def second(input: str | Path) -> int:
-    ranges = parse_input(input)
+def second_slow(input: str | Path) -> int:
+    ranges = merge_ranges(parse_input(input))
 
-    invalid: set[int] = set()
+    invalid: list[int] = []
     for start, end in ranges:
         for i in range(start, end + 1):
             # now we have to check all divisors
@@ -79,12 +88,190 @@ def second(input: str | Path) -> int:
                 root = str_i[:divisor]
                 times = str_i_len // divisor
                 if root * times == str_i:
-                    invalid.add(i)
+                    invalid.append(i)
                     break
 
     return sum(invalid)
 
 
+def prime_factors(n: int) -> list[int]:
+    factors: list[int] = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            factors.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+# the number that repeats a root of `period` digits to `length` digits, e.g. 10101 for (5, 1)
+# a number with `length` digits is made of such a root exactly if it is divisible by it
+def repeater(length: int, period: int) -> int:
+    return (10**length - 1) // (10**period - 1)
+
+
+def repeated_ids(start: int, end: int) -> Iterator[int]:
+    # every number is periodic with length // p for at least one prime factor p of its length,
+    # so those periods are enough. numbers that are periodic for two prime factors p and q
+    # are also periodic for length // (p * q), this is used to only yield them the first time.
+    for length in range(len(str(start)), len(str(end)) + 1):
+        low = max(start, 10 ** (length - 1))
+        high = min(end, 10**length - 1)
+        primes = prime_factors(length)
+
+        for idx, p in enumerate(primes):
+            period = length // p
+            rep = repeater(length, period)
+            overlaps = [repeater(length, period // q) for q in primes[:idx]]
+
+            first_root = max(10 ** (period - 1), -(-low // rep))
+            last_root = min(10**period - 1, high // rep)
+            for root in range(first_root, last_root + 1):
+                n = root * rep
+                if any(n % o == 0 for o in overlaps):
+                    continue  # already yielded for a previous prime factor
+                yield n
+
+
+# count and sum of all ids in [start, end] with `period` digits repeated to `length` digits
+def periodic_sum(start: int, end: int, length: int, period: int) -> tuple[int, int]:
+    rep = repeater(length, period)
+    first_root = max(10 ** (period - 1), -(-start // rep))
+    last_root = min(10**period - 1, end // rep)
+    if first_root > last_root:
+        return 0, 0
+
+    # the ids are rep * root for consecutive roots, so this is an arithmetic series
+    count = last_root - first_root + 1
+    return count, rep * (first_root + last_root) * count // 2
+
+
+def invalid_sum(start: int, end: int, doubled_only: bool = False) -> tuple[int, int]:
+    # same sets as in repeated_ids, but instead of skipping overlaps they are subtracted
+    # (and added back, ...) via inclusion-exclusion over the prime factors of the length
+    count, total = 0, 0
+    for length in range(len(str(start)), len(str(end)) + 1):
+        primes = [2] if length % 2 == 0 else []
+        if not doubled_only:
+            primes = prime_factors(length)
+
+        for mask in range(1, 2 ** len(primes)):
+            divisor = math.prod(p for i, p in enumerate(primes) if mask >> i & 1)
+            sign = 1 if mask.bit_count() % 2 == 1 else -1
+            c, t = periodic_sum(start, end, length, length // divisor)
+            count += sign * c
+            total += sign * t
+
+    return count, total
+
+
+# the prefix sums are stored as unsigned 64 bit ints and the sum of all invalid ids
+# passes 2**64 a little above 2.14 * 10**13, so the bound is capped below that
+MAX_INDEX_BOUND = 2 * 10**13
+
+
+class InvalidIndex:
+    """All invalid ids up to a bound, sorted and with prefix sums, for O(log n) range sums.
+
+    The prefix sums are 64 bit, so the bound can be at most MAX_INDEX_BOUND.
+    """
+
+    def __init__(self, bound: int, doubled_only: bool, ids: array, prefix: array):
+        self.bound = bound
+        self.doubled_only = doubled_only
+        self.ids = ids
+        self.prefix = prefix  # prefix[k] is the sum of the first k ids
+
+    @classmethod
+    def build(cls, bound: int, doubled_only: bool = False) -> "InvalidIndex":
+        if bound > MAX_INDEX_BOUND:
+            raise ValueError(
+                f"Index bound {bound} is too large, the largest supported bound is {MAX_INDEX_BOUND}"
+            )
+        if doubled_only:
+            ids = array("Q", doubled_ids(1, bound))
+        else:
+            ids = array("Q", sorted(repeated_ids(1, bound)))
+        prefix = array("Q", accumulate(ids, initial=0))
+        return cls(bound, doubled_only, ids, prefix)
+
+    def query(self, start: int, end: int) -> tuple[int, int]:
+        if end > self.bound:
+            raise ValueError(
+                f"Range {start}-{end} exceeds the index bound {self.bound}"
+            )
+        lo = bisect_left(self.ids, start)
+        hi = bisect_right(self.ids, end)
+        return hi - lo, self.prefix[hi] - self.prefix[lo]
+
+    # file layout: bound, doubled_only, number of ids, then the ids and the prefix sums
+    def save(self, path: Path):
+        with path.open("wb") as f:
+            array("Q", [self.bound, self.doubled_only, len(self.ids)]).tofile(f)
+            self.ids.tofile(f)
+            self.prefix.tofile(f)
+
+    @classmethod
+    def load(cls, path: Path) -> "InvalidIndex":
+        with path.open("rb") as f:
+            header = array("Q")
+            header.fromfile(f, 3)
+            bound, doubled_only, n = header
+            ids = array("Q")
+            ids.fromfile(f, n)
+            prefix = array("Q")
+            prefix.fromfile(f, n + 1)
+        return cls(bound, bool(doubled_only), ids, prefix)
+
+    @classmethod
+    def cached(
+        cls, path: Path, bound: int, doubled_only: bool = False
+    ) -> "InvalidIndex":
+        if path.exists():
+            index = cls.load(path)
+            if index.bound >= bound and index.doubled_only == doubled_only:
+                return index
+
+        index = cls.build(bound, doubled_only)
+        index.save(path)
+        return index
+
+
+def total_invalid(
+    ranges: list[tuple[int, int]],
+    doubled_only: bool = False,
+    index: InvalidIndex | None = None,
+) -> int:
+    total = 0
+    for start, end in merge_ranges(ranges):
+        if index is not None:
+            total += index.query(start, end)[1]
+        else:
+            total += invalid_sum(start, end, doubled_only)[1]
+
+    return total
+
+
+def second(input: str | Path) -> int:
+    return total_invalid(parse_input(input))
+
+
+def first_indexed(input: str | Path, index: InvalidIndex) -> int:
+    if not index.doubled_only:
+        raise ValueError("first needs an index of the doubled ids")
+    return total_invalid(parse_input(input), index=index)
+
+
+def second_indexed(input: str | Path, index: InvalidIndex) -> int:
+    if index.doubled_only:
+        raise ValueError("second needs an index of all repeated ids")
+    return total_invalid(parse_input(input), index=index)
+
+
 if __name__ == "__main__":
     test_first = first(TEST_FIRST)
     print(f"Test first: {test_first}")
@@ -93,9 +280,25 @@ if __name__ == "__main__":
     prod_first = first(Path("./days/02/input/first"))
     print(f"Prod first: {prod_first}")
 
+    ranges = merge_ranges(parse_input(Path("./days/02/input/first")))
+    assert prod_first == sum(i for r in ranges for i in doubled_ids(*r))
+
     test_second = second(TEST_FIRST)
     print(f"Test second: {test_second}")
     assert test_second == 4174379265
 
     prod_second = second(Path("./days/02/input/first"))
     print(f"Prod second: {prod_second}")
+    assert prod_second == sum(i for r in ranges for i in repeated_ids(*r))
+
+    with TemporaryDirectory() as tmp:
+        for doubled_only, solve, expected in [
+            (True, first_indexed, prod_first),
+            (False, second_indexed, prod_second),
+        ]:
+            path = Path(tmp) / f"index_{doubled_only}"
+            InvalidIndex.cached(path, 10**10, doubled_only)
+            index = InvalidIndex.cached(path, 10**10, doubled_only)  # loaded from disk
+            result = solve(Path("./days/02/input/first"), index)
+            print(f"Prod indexed ({len(index.ids)} ids): {result}")
+            assert result == expected
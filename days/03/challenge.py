@@ -1,4 +1,5 @@
 from pathlib import Path
+import numpy as np
 
 TEST_FIRST = """
 987654321111111
@@ -24,48 +25,71 @@ def parse_input(input: str | Path) -> list[list[int]]:
     return rows
 
 
-def first(input: str | Path) -> int:
-    banks = parse_input(input)
+# largest number made of k batteries of the bank, keeping their order. this is the
+# "remove n - k digits" greedy: a digit is dropped as soon as a larger one follows it,
+# as long as we are still allowed to drop digits.
+def max_joltage(bank: list[int], k: int) -> int:
+    if not 0 < k <= len(bank):
+        raise ValueError(f"Cannot pick {k} batteries from a bank of {len(bank)}")
 
-    max_joltages: list[int] = []
-    for bank in banks:
-        first: int = bank[0]
-        second: int = bank[1]
+    to_remove = len(bank) - k
+    batteries: list[int] = []
+    for joltage in bank:
+        while to_remove and batteries and batteries[-1] < joltage:
+            batteries.pop()
+            to_remove -= 1
+        batteries.append(joltage)
 
-        for joltage in bank[2:]:
-            if second > first:
-                first = second
-                second = joltage
-            elif joltage > second:
-                second = joltage
+    return int("".join(str(b) for b in batteries[:k]))
 
-        comb = first * 10 + second
-        max_joltages.append(comb)
 
-    return sum(max_joltages)
+def first(input: str | Path) -> int:
+    banks = parse_input(input)
+    return sum(max_joltage(bank, 2) for bank in banks)
 
 
 def second(input: str | Path) -> int:
     banks = parse_input(input)
+    return sum(max_joltage(bank, 12) for bank in banks)
+
 
-    max_joltages: list[int] = []
-    for bank in banks:
-        batteries = bank[:12]
+# all banks as one (rows, cols) array of digits, only works if all banks have the same length
+def parse_matrix(input: str | Path) -> np.ndarray:
+    if isinstance(input, Path):
+        data = input.read_bytes()
+    else:
+        data = input.encode()
 
-        for joltage in bank[12:]:
-            for i in range(12 - 1):
-                if batteries[i] < batteries[i + 1]:
-                    batteries.pop(i)
-                    batteries.append(joltage)
-                    break
-            if joltage > batteries[-1]:
-                batteries[-1] = joltage
+    lines = data.split()
+    width = len(lines[0])
+    if any(len(line) != width for line in lines):
+        raise ValueError("All banks need the same length")
 
-        comb = int("".join([str(b) for b in batteries]))
-        print(bank, comb)
-        max_joltages.append(comb)
+    return np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(-1, width) - ord("0")
 
-    return sum(max_joltages)
+
+# max_joltage for all banks at once. digit p of the result is the largest digit in the
+# window from after the previous pick up to the last position that still leaves room
+# for the remaining digits, argmax picks the leftmost one like the greedy does.
+def batch_joltage(input: str | Path, k: int) -> int:
+    # signed, so -1 can mark outside the window
+    banks = parse_matrix(input).astype(np.int8)
+    rows, cols = banks.shape
+    if not 0 < k <= min(cols, 18):
+        raise ValueError(f"Cannot pick {k} batteries from banks of {cols}")
+
+    positions = np.arange(cols)
+    start = np.zeros(rows, dtype=np.int64)
+    joltages = np.zeros(rows, dtype=np.int64)
+    for p in range(k):
+        end = cols - k + p
+        window = (positions >= start[:, None]) & (positions <= end)
+        picked = np.argmax(np.where(window, banks, -1), axis=1)
+
+        joltages = joltages * 10 + banks[np.arange(rows), picked]
+        start = picked + 1
+
+    return sum(joltages.tolist())
 
 
 # first
@@ -83,3 +107,8 @@ assert test_res == 3121910778619
 
 prod_res = second(Path("./days/03/input/first"))
 print(f"Second first: {prod_res}")
+
+# batched
+assert batch_joltage(TEST_FIRST, 2) == 357
+assert batch_joltage(TEST_FIRST, 12) == 3121910778619
+assert batch_joltage(Path("./days/03/input/first"), 12) == prod_res
@@ -1,5 +1,8 @@
 from pathlib import Path
 from enum import Enum
+from collections import deque
+from dataclasses import dataclass
+import numpy as np
 
 
 class Field(Enum):
@@ -73,43 +76,195 @@ def first(input: str | Path) -> int:
 
 
 def second(input: str | Path) -> int:
+    # peel the rolls like a k-core: count the neighbours of every roll once, then keep a
+    # queue of the accessible ones. removing a roll only changes its neighbours' counts,
+    # so only those can become accessible and need to be looked at again.
     field = parse_input(input)
     y_len = len(field)
     x_len = len(field[0])
 
-    removed = 0
+    def neighbours(x: int, y: int) -> list[tuple[int, int]]:
+        return [
+            (x + offset_x, y + offset_y)
+            for offset_x in range(-1, 2)
+            for offset_y in range(-1, 2)
+            if (offset_x or offset_y)
+            and 0 <= x + offset_x < x_len
+            and 0 <= y + offset_y < y_len
+            and field[y + offset_y][x + offset_x] == Field.ROLL
+        ]
 
-    y = 0
-    while y < y_len:
-        x = 0
-        while x < x_len:
+    counts: dict[tuple[int, int], int] = {}
+    queue: deque[tuple[int, int]] = deque()
+    for y in range(y_len):
+        for x in range(x_len):
             if field[y][x] == Field.EMPTY:
-                x += 1
                 continue
+            counts[(x, y)] = len(neighbours(x, y))
+            if counts[(x, y)] < 4:
+                queue.append((x, y))
 
-            rolls = 0
-            for offset_x in range(-1, 2):
-                for offset_y in range(-1, 2):
-                    if x + offset_x < 0 or x + offset_x >= x_len:
-                        continue
-                    if y + offset_y < 0 or y + offset_y >= y_len:
-                        continue
+    removed = 0
+    while queue:
+        x, y = queue.popleft()
+        field[y][x] = Field.EMPTY
+        removed += 1
 
-                    if field[y + offset_y][x + offset_x] == Field.ROLL:
-                        rolls += 1
-
-            if rolls - 1 < 4:
-                removed += 1
-                field[y][x] = Field.EMPTY
-                x = max(x - 1, 0)
-                y = max(y - 1, 0)
-            else:
-                x += 1
-        y += 1
+        for neighbour in neighbours(x, y):
+            counts[neighbour] -= 1
+            # every roll is only queued once, when it drops below 4
+            if counts[neighbour] == 3:
+                queue.append(neighbour)
 
     return removed
 
 
+# a line as a row bitmask, reversed so that column x ends up in bit x. like in
+# parse_input everything that is not a "." counts as a roll.
+def row_bits(line: str, width: int) -> int:
+    return int("".join("0" if c == "." else "1" for c in reversed(line[:width])), 2)
+
+
+# the accessible rolls of a row, given the rows above and below (0 outside of the grid).
+# the 8 neighbours of a whole row are shifted copies of the rows above, itself and below.
+# they are added up bit-sliced: bit x of count[i] is bit i of the count of column x.
+def accessible_row(above: int, row: int, below: int, width: int) -> int:
+    mask = (1 << width) - 1
+    count = [0, 0, 0, 0]
+    for n in (
+        above << 1, above, above >> 1,
+        row << 1, row >> 1,
+        below << 1, below, below >> 1,
+    ):  # fmt: skip
+        carry = n & mask
+        for i in range(4):
+            count[i], carry = count[i] ^ carry, count[i] & carry
+
+    # fewer than 4 neighbours means bits 2 and 3 of the count are both 0
+    return row & ~(count[2] | count[3])
+
+
+@dataclass
+class RollGrid:
+    """One int per row with bit x set if there is a roll in column x."""
+
+    width: int
+    rows: list[int]
+
+    @classmethod
+    def from_input(cls, input: str | Path) -> "RollGrid":
+        if isinstance(input, Path):
+            input = input.read_text()
+
+        lines = [line.strip() for line in input.splitlines() if line.strip()]
+        # the width is taken from the first row, like in parse_input
+        width = len(lines[0])
+        return cls(width=width, rows=[row_bits(line, width) for line in lines])
+
+    def accessible(self) -> list[int]:
+        padded = [0] + self.rows + [0]
+        return [
+            accessible_row(padded[y - 1], padded[y], padded[y + 1], self.width)
+            for y in range(1, len(padded) - 1)
+        ]
+
+
+# first without loading the grid: the file is read line by line and only the rows
+# above and below the current one are kept, so memory only depends on the width
+def first_streaming(path: Path) -> int:
+    total = 0
+    width = 0
+    above, row = 0, None
+    with path.open() as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+
+            width = width or len(line)
+            below = row_bits(line, width)
+            if row is not None:
+                total += accessible_row(above, row, below, width).bit_count()
+                above = row
+            row = below
+
+    if row is not None:
+        total += accessible_row(above, row, 0, width).bit_count()
+
+    return total
+
+
+def first_bits(input: str | Path) -> int:
+    grid = RollGrid.from_input(input)
+    return sum(row.bit_count() for row in grid.accessible())
+
+
+def second_bits(input: str | Path) -> int:
+    # removes all accessible rolls at once until none are left, the rolls that stay
+    # are the same as when removing them one by one
+    grid = RollGrid.from_input(input)
+
+    removed = 0
+    while True:
+        accessible = grid.accessible()
+        count = sum(row.bit_count() for row in accessible)
+        if count == 0:
+            return removed
+
+        removed += count
+        grid.rows = [row & ~a for row, a in zip(grid.rows, accessible)]
+
+
+# bool array of the rolls, same rules as parse_input
+def roll_array(input: str | Path) -> np.ndarray:
+    if isinstance(input, Path):
+        input = input.read_text()
+
+    lines = [line.strip() for line in input.splitlines() if line.strip()]
+    width = len(lines[0])
+    data = "".join(line[:width].ljust(width, ".") for line in lines).encode()
+    return (np.frombuffer(data, dtype=np.uint8) != ord(".")).reshape(-1, width)
+
+
+# number of rolls around every cell, as the sum of the 8 shifted slices of a padded copy
+def neighbour_counts(rolls: np.ndarray) -> np.ndarray:
+    padded = np.pad(rolls.astype(np.uint8), 1)
+    y_len, x_len = rolls.shape
+    counts = np.zeros((y_len, x_len), dtype=np.uint8)
+    for offset_y in range(3):
+        for offset_x in range(3):
+            if offset_y == 1 and offset_x == 1:
+                continue
+            counts += padded[offset_y : offset_y + y_len, offset_x : offset_x + x_len]
+    return counts
+
+
+def first_np(input: str | Path) -> int:
+    rolls = roll_array(input)
+    return int(np.count_nonzero(rolls & (neighbour_counts(rolls) < 4)))
+
+
+# removes all accessible rolls at once per wave until nothing changes anymore,
+# returns how many were removed in each wave
+def peel_waves(rolls: np.ndarray) -> list[int]:
+    rolls = rolls.copy()
+    waves: list[int] = []
+    while True:
+        accessible = rolls & (neighbour_counts(rolls) < 4)
+        removed = int(np.count_nonzero(accessible))
+        if removed == 0:
+            return waves
+
+        waves.append(removed)
+        rolls &= ~accessible
+
+
+def second_np(input: str | Path) -> int:
+    waves = peel_waves(roll_array(input))
+    print(f"Removed in {len(waves)} waves: {waves}")
+    return sum(waves)
+
+
 # first
 test_res = first(TEST_FIRST)
 print(f"First (Test): {test_res}")
@@ -118,6 +273,14 @@ assert test_res == 13
 prod_res = first(Path("./days/04/input/first"))
 print(f"First (Prod): {prod_res}")
 
+assert first_bits(TEST_FIRST) == 13
+assert first_bits(Path("./days/04/input/first")) == prod_res
+
+assert first_np(TEST_FIRST) == 13
+assert first_np(Path("./days/04/input/first")) == prod_res
+
+assert first_streaming(Path("./days/04/input/first")) == prod_res
+
 # second
 test_res = second(TEST_FIRST)
 print(f"Second (Test): {test_res}")
@@ -125,3 +288,9 @@ assert test_res == 43
 
 prod_res = second(Path("./days/04/input/first"))
 print(f"Second (Prod): {prod_res}")
+
+assert second_bits(TEST_FIRST) == 43
+assert second_bits(Path("./days/04/input/first")) == prod_res
+
+assert second_np(TEST_FIRST) == 43
+assert second_np(Path("./days/04/input/first")) == prod_res
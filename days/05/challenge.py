@@ -1,5 +1,10 @@
 from pathlib import Path
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from operator import itemgetter
 
+import numpy as np
 
 TEST_FIRST = """
 3-5
@@ -40,6 +45,123 @@ def parse_input(input: str | Path) -> tuple[list[tuple[int, int]], list[int]]:
     return ranges, ids_to_check
 
 
+def merge_ranges(ranges: list[tuple[int, int]]) -> tuple[list[tuple[int, int]], int]:
+    """Merge overlapping or touching ranges, returning them with the number of ids covered."""
+    merged: list[tuple[int, int]] = []
+    covered = 0
+    if not ranges:
+        return merged, covered
+
+    # the order of equal starts does not matter, so comparing the start alone is enough
+    ordered = sorted(ranges, key=itemgetter(0))
+    current_start, current_end = ordered[0]
+    for start, end in ordered:
+        if start <= current_end + 1:
+            current_end = max(current_end, end)
+        else:
+            merged.append((current_start, current_end))
+            covered += current_end - current_start + 1
+            current_start, current_end = start, end
+    merged.append((current_start, current_end))
+    covered += current_end - current_start + 1
+    return merged, covered
+
+
+# intervals per chunk of the index. a chunk is split once it holds twice as many,
+# so shifting inside a chunk is bounded while the list of chunks stays short.
+CHUNK_SIZE = 1 << 9
+
+
+class FreshIndex:
+    """Sorted, merged fresh ranges kept as a list of chunks of parallel start and end arrays."""
+
+    def __init__(self, ranges: list[tuple[int, int]]):
+        merged, covered = merge_ranges(ranges)
+        self.starts: list[array] = []
+        self.ends: list[array] = []
+        for k in range(0, len(merged), CHUNK_SIZE):
+            chunk = merged[k : k + CHUNK_SIZE]
+            self.starts.append(array("Q", [start for start, _ in chunk]))
+            self.ends.append(array("Q", [end for _, end in chunk]))
+        self.heads = [starts[0] for starts in self.starts]  # first start per chunk
+        self.covered = covered
+
+    def add_range(self, start: int, end: int) -> None:
+        # first stored range that could overlap or touch the new one, as (chunk, position)
+        c = bisect_right(self.heads, start) - 1
+        if c < 0:
+            c, k = 0, 0
+        else:
+            k = bisect_right(self.starts[c], start) - 1
+            if self.ends[c][k] + 1 < start:
+                k += 1
+
+        # absorb the run of ranges that overlap or touch it, each one is removed only once
+        while c < len(self.starts):
+            starts, ends = self.starts[c], self.ends[c]
+            if k == len(starts):
+                if c + 1 == len(self.starts):
+                    break
+                c, k = c + 1, 0
+                continue
+            if starts[k] > end + 1:
+                break
+            self.covered -= ends[k] - starts[k] + 1
+            start, end = min(start, starts[k]), max(end, ends[k])
+            del starts[k]
+            del ends[k]
+            if not starts:
+                del self.starts[c]
+                del self.ends[c]
+                del self.heads[c]
+
+        if not self.starts:
+            self.starts.append(array("Q"))
+            self.ends.append(array("Q"))
+            self.heads.append(start)
+        elif c == len(self.starts):
+            c = len(self.starts) - 1
+            k = len(self.starts[c])
+
+        starts, ends = self.starts[c], self.ends[c]
+        starts.insert(k, start)
+        ends.insert(k, end)
+        self.heads[c] = starts[0]
+        self.covered += end - start + 1
+
+        if len(starts) > 2 * CHUNK_SIZE:
+            self.starts[c + 1 : c + 1] = [starts[CHUNK_SIZE:]]
+            self.ends[c + 1 : c + 1] = [ends[CHUNK_SIZE:]]
+            self.heads.insert(c + 1, starts[CHUNK_SIZE])
+            del starts[CHUNK_SIZE:]
+            del ends[CHUNK_SIZE:]
+
+    def total_fresh(self) -> int:
+        return self.covered
+
+    def is_fresh(self, id: int) -> bool:
+        # the last range starting at or before the id is the only one that can contain it
+        c = bisect_right(self.heads, id) - 1
+        if c < 0:
+            return False
+        k = bisect_right(self.starts[c], id) - 1
+        return id <= self.ends[c][k]
+
+    def count_fresh(self, ids: list[int]) -> int:
+        # sorted ids and sorted ranges, so both can be walked through once
+        ranges = zip(chain.from_iterable(self.starts), chain.from_iterable(self.ends))
+        current = next(ranges, None)
+        count = 0
+        for id in sorted(ids):
+            while current is not None and current[1] < id:
+                current = next(ranges, None)
+            if current is None:
+                break
+            if current[0] <= id:
+                count += 1
+        return count
+
+
 def first(input: str | Path) -> int:
     # col x row
     ranges, ids_to_check = parse_input(input)
@@ -56,30 +178,31 @@ def first(input: str | Path) -> int:
 def second(input: str | Path) -> int:
     # col x row
     ranges, _ = parse_input(input)
+    _, covered = merge_ranges(ranges)
+    return covered
 
-    starts: list[int] = []
-    ends: list[int] = []
-    for start, end in ranges:
-        starts.append(start)
-        ends.append(end)
 
-    sorted_starts = sorted(starts)
-    sorted_ends = sorted(ends)
+def first_indexed(input: str | Path) -> int:
+    ranges, ids_to_check = parse_input(input)
+    return FreshIndex(ranges).count_fresh(ids_to_check)
 
-    total = 0
-    while len(sorted_starts) > 1:
-        if sorted_ends[0] >= sorted_starts[1]:
-            sorted_starts.pop(1)
-            sorted_ends.pop(0)
-        else:
-            range_len = len(range(sorted_starts[0], sorted_ends[0] + 1))
-            total += range_len
-            sorted_starts.pop(0)
-            sorted_ends.pop(0)
 
-    total += len(range(sorted_starts[0], sorted_ends[0] + 1))
+def first_np(input: str | Path) -> int:
+    if isinstance(input, Path):
+        input = input.read_text()
+    range_text, id_text = input.strip().split("\n\n")
+    ids = np.fromstring(id_text, dtype=np.uint64, sep=" ")
+    bounds = np.fromstring(range_text.replace("-", " "), dtype=np.uint64, sep=" ")
+    bounds = bounds.reshape(-1, 2)
 
-    return total
+    # with the starts sorted, the running max of the ends is how far the ranges
+    # starting at or before each start reach, so no explicit merge is needed
+    order = np.argsort(bounds[:, 0], kind="stable")
+    starts = bounds[order, 0]
+    reach = np.maximum.accumulate(bounds[order, 1])
+
+    i = np.searchsorted(starts, ids, side="right") - 1
+    return int(np.count_nonzero((i >= 0) & (ids <= reach[np.maximum(i, 0)])))
 
 
 # first
@@ -90,6 +213,11 @@ assert test_res == 3
 prod_res = first(Path("./days/05/input/first"))
 print(f"First (Prod): {prod_res}")
 
+assert first_indexed(TEST_FIRST) == 3
+assert first_indexed(Path("./days/05/input/first")) == prod_res
+assert first_np(TEST_FIRST) == 3
+assert first_np(Path("./days/05/input/first")) == prod_res
+
 # second
 test_res = second(TEST_FIRST)
 print(f"Second (Test): {test_res}")
@@ -97,3 +225,12 @@ assert test_res == 14
 
 prod_res = second(Path("./days/05/input/first"))
 print(f"Second (Prod): {prod_res}")
+
+# ranges arriving one at a time end up with the same coverage
+for input in (TEST_FIRST, Path("./days/05/input/first")):
+    ranges, ids_to_check = parse_input(input)
+    incremental = FreshIndex([])
+    for start, end in ranges:
+        incremental.add_range(start, end)
+    assert incremental.total_fresh() == second(input)
+    assert sum(incremental.is_fresh(id) for id in ids_to_check) == first(input)
@@ -1,9 +1,13 @@
 from pathlib import Path
 from enum import Enum
 from collections import defaultdict
+from tempfile import TemporaryDirectory
 import math
+import mmap
 import re
 
+import numpy as np
+
 
 class Operation(Enum):
     ADDITION = 1
@@ -107,6 +111,80 @@ def second(input: str | Path) -> int:
     return total
 
 
+# read the sheet as a rows x width byte matrix, the problems are then just column slices
+def sheet_matrix(input: str | Path) -> np.ndarray:
+    if isinstance(input, Path):
+        input = input.read_text()
+
+    lines = [line for line in input.splitlines() if line]
+    width = max(len(line) for line in lines)
+    data = "".join(line.ljust(width) for line in lines).encode()
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(lines), width)
+
+
+def second_columnar(input: str | Path) -> int:
+    sheet = sheet_matrix(input)
+    digits, op_row = sheet[:-1], sheet[-1]
+    if len(digits) > 18:
+        raise ValueError(f"Cannot fit numbers of {len(digits)} digits into int64")
+
+    # each column read top to bottom is one number, build all of them at once
+    is_digit = digits != ord(" ")
+    values = np.zeros(sheet.shape[1], dtype=np.int64)
+    for row, row_is_digit in zip(digits, is_digit):
+        values = np.where(row_is_digit, values * 10 + (row - ord("0")), values)
+
+    # problems are separated by columns that are blank all the way down
+    blank = (sheet == ord(" ")).all(axis=0)
+    edges = np.flatnonzero(np.diff(np.concatenate(([True], blank, [True]))))
+
+    total = 0
+    for start, stop in zip(edges[::2], edges[1::2]):
+        op = Operation.from_str(chr(op_row[start]))
+        total += execute(values[start:stop].tolist(), op)
+    return total
+
+
+# every line has the same length, so column c of the sheet is every stride-th byte
+# starting at c. only the current problem's numbers are ever held in memory.
+def second_mmap(path: Path) -> int:
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        width = mm.find(b"\n")
+        if width <= 0:
+            raise ValueError("Unexpected Input")
+        stride = width + 1
+
+        # every line must be exactly stride bytes, only the last may miss its newline
+        rows = (len(mm) + 1) // stride
+        if rows < 2 or len(mm) not in (rows * stride, rows * stride - 1):
+            raise ValueError("Unexpected Input")
+        for r in range(rows):
+            line_end = r * stride + width
+            expected = line_end if line_end < len(mm) else -1
+            if mm.find(b"\n", r * stride, line_end + 1) != expected:
+                raise ValueError("Unexpected Input")
+
+        total = 0
+        numbers: list[int] = []
+        op = Operation.ADDITION
+        for c in range(width):
+            column = mm[c::stride]
+            if column.isspace():
+                if numbers:
+                    total += execute(numbers, op)
+                    numbers = []
+                continue
+
+            # the operator sits below the first column of each problem
+            if not numbers:
+                op = Operation.from_str(chr(column[-1]))
+            numbers.append(int(column[:-1]))
+
+        if numbers:
+            total += execute(numbers, op)
+        return total
+
+
 # first
 test_res = first(TEST_FIRST)
 print(f"First (Test): {test_res}")
@@ -122,3 +200,12 @@ assert test_res == 3263827
 
 prod_res = second(Path("./days/06/input/first"))
 print(f"Second (Prod): {prod_res}")
+
+assert second_columnar(TEST_FIRST) == 3263827
+assert second_columnar(Path("./days/06/input/first")) == prod_res
+
+assert second_mmap(Path("./days/06/input/first")) == prod_res
+with TemporaryDirectory() as tmp:
+    test_path = Path(tmp) / "test"
+    test_path.write_text(TEST_FIRST.lstrip("\n"))
+    assert second_mmap(test_path) == 3263827
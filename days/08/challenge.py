@@ -1,33 +1,55 @@
 from pathlib import Path
 from time import perf_counter
-from dataclasses import dataclass
+from array import array
+from collections import defaultdict
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itertools import chain, islice, product
 import math
+import numpy as np
 
 # This would be so much easier if I only allowed myself to use numpy or scipy.
 # Also it helps to read the task clearly in order not to wonder for 10 minutes
 # where you went wrong as you implemented something different than wanted.
 
 
-@dataclass
-class Box:
-    x: int
-    y: int
-    z: int
+class Circuits:
+    """Disjoint set over box indices (path compression + union by size)."""
 
-    @classmethod
-    def from_list(cls, v: list[int]) -> "Box":
-        if not len(v) == 3:
-            raise ValueError
-        return cls(x=v[0], y=v[1], z=v[2])
+    def __init__(self, n: int):
+        self.parent = array("l", range(n))
+        self.size = array("l", [1] * n)
 
-    def to_list(self) -> list[int]:
-        return [self.x, self.y, self.z]
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # compress the path so the next lookup is direct
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
 
-    @classmethod
-    def distance(cls, first: "Box", second: "Box") -> float:
-        # could implement distance myself, but math.dist already does euclidean
-        # I think this is fair, even though I dont want to use too many external packages
-        return math.dist(first.to_list(), second.to_list())
+    def union(self, i: int, j: int) -> bool:
+        """Join the circuits of i and j, returns False if they already were one."""
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        return True
+
+    def circuit_size(self, i: int) -> int:
+        return self.size[self.find(i)]
+
+    def roots(self) -> np.ndarray:
+        return np.array([self.find(i) for i in range(len(self.parent))], dtype=np.int64)
+
+    def sizes(self) -> list[int]:
+        return [self.size[i] for i in range(len(self.parent)) if self.parent[i] == i]
 
 
 TEST_FIRST = """
@@ -54,120 +76,499 @@ TEST_FIRST = """
 """
 
 
-def parse_input(input: str | Path) -> list[Box]:
+# one row per box, with the x, y and z coordinate as columns
+def parse_input(input: str | Path) -> np.ndarray:
     if isinstance(input, Path):
         input = input.read_text()
 
-    boxes = []
+    values: list[int] = []
     for row in input.splitlines():
         if not row:
             continue
 
-        coords = row.split(",")
-        boxes.append(Box(x=int(coords[0]), y=int(coords[1]), z=int(coords[2])))
-
-    return boxes
-
-
-def first(input: str | Path, connections: int) -> int:
-    # col x row
-    boxes = parse_input(input)
-
-    # lets try to use references here to make my life easier later on (with less looped checks)
-    circuits: dict[int, list[int]] = {i: [i] for i in range(len(boxes))}
-
-    # calc the distance matrix and put them in a list for sorting
-    # this is a list of tuples with each tuple containing a tuple with the indeces and the distance
-    distances: list[tuple[float, tuple[int, int]]] = []
-    for i, b1 in enumerate(boxes):
-        for j, b2 in enumerate(boxes):
-            if i == j:
-                continue  # no need to compute
-            elif i > j:
-                continue  # already computed previously
-            else:
-                distances.append((Box.distance(b1, b2), (i, j)))
-    distances.sort(key=lambda x: x[0])
+        values.extend(int(c) for c in row.split(","))
+
+    return np.array(values, dtype=np.int64).reshape(-1, 3)
+
+
+# squared distances between all boxes of rows and all boxes of cols as one block.
+# the squared distance is enough for ordering and stays an exact integer.
+def squared_distances(rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # one axis at a time, so there is no temporary with three values per pair
+    d = np.zeros((len(rows), len(cols)), dtype=np.int64)
+    for axis in range(3):
+        d += (rows[:, None, axis] - cols[None, :, axis]) ** 2
+    return d
+
+
+# upper bound for the number of distances computed per kernel call (~8 MB per array)
+BLOCK_ELEMENTS = 1 << 20
+
+
+# pairs are kept as three parallel arrays: squared distance, i and j with i < j
+Pairs = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def concat_pairs(parts: list[Pairs]) -> Pairs:
+    if not parts:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    d, i, j = zip(*parts)
+    return np.concatenate(d), np.concatenate(i), np.concatenate(j)
+
+
+# ties are broken by the indeces, same as a stable sort over the generation order
+def sort_pairs(pairs: Pairs) -> Pairs:
+    d, i, j = pairs
+    order = np.lexsort((j, i, d))
+    return d[order], i[order], j[order]
+
+
+def iter_pairs(pairs: Pairs) -> Iterator[tuple[int, tuple[int, int]]]:
+    # converted to python ints in slices, a whole batch as tuples would be a lot larger
+    d, i, j = pairs
+    for start in range(0, len(d), 1 << 16):
+        part = slice(start, start + (1 << 16))
+        yield from zip(d[part].tolist(), zip(i[part].tolist(), j[part].tolist()))
+
+
+# the pairs between own and others with lower < d (<= upper), oriented so that i < j.
+# own is split into blocks so that no block has more than BLOCK_ELEMENTS distances.
+# the first `shared` columns of others may be boxes of own as well, for them only i < j
+# is kept so that every pair is only produced once. with roots (the circuit of each box),
+# pairs within one circuit are dropped.
+def block_pairs(
+    coords: np.ndarray,
+    own: np.ndarray,
+    others: np.ndarray,
+    lower: int = -1,
+    upper: int | None = None,
+    shared: int = 0,
+    roots: np.ndarray | None = None,
+) -> Iterator[Pairs]:
+    step = max(1, BLOCK_ELEMENTS // max(len(others), 1))
+    for start in range(0, len(own), step):
+        rows = own[start : start + step]
+        d = squared_distances(coords[rows], coords[others])
+
+        keep = d > lower
+        if upper is not None:
+            keep &= d <= upper
+        keep[:, :shared] &= rows[:, None] < others[None, :shared]
+        if roots is not None:
+            # already in the same circuit, so kruskal would skip them anyway
+            keep &= roots[rows][:, None] != roots[others][None, :]
+
+        r, c = np.nonzero(keep)
+        i, j = rows[r], others[c]
+        yield d[r, c], np.minimum(i, j), np.maximum(i, j)
+
+
+# all pairs with a distance above lower, only the columns right of the row block are computed
+def box_pairs(
+    coords: np.ndarray, lower: int = -1, roots: np.ndarray | None = None
+) -> Iterator[Pairs]:
+    n = len(coords)
+    step = max(1, BLOCK_ELEMENTS // max(n, 1))
+    for start in range(0, n, step):
+        own = np.arange(start, min(start + step, n), dtype=np.int64)
+        others = np.arange(start, n, dtype=np.int64)
+        yield from block_pairs(
+            coords, own, others, lower, shared=len(others), roots=roots
+        )
+
+
+# the pairs with the k smallest distances, plus all that tie with the k-th one.
+# pairs with equal distance are all kept, so the result is an exact prefix of the
+# sorted pairs and the next batch can simply continue above its largest distance.
+def next_batch(blocks: Iterator[Pairs], k: int) -> Pairs:
+    best = concat_pairs([])
+    limit = None  # k-th distance so far, nothing above it can make it into the batch
+    for d, i, j in blocks:
+        if limit is not None:
+            keep = d <= limit
+            d, i, j = d[keep], i[keep], j[keep]
+        if len(d) == 0:
+            continue
 
-    for _ in range(connections):
-        # get smallest distance
-        _, (i, j) = distances[0]
-        distances.pop(0)
+        d, i, j = concat_pairs([best, (d, i, j)])
+        if len(d) > k:
+            limit = np.partition(d, k - 1)[k - 1]
+            keep = d <= limit
+            d, i, j = d[keep], i[keep], j[keep]
+        best = d, i, j
+    return sort_pairs(best)
 
-        # check if they are in the same circuit
-        if circuits[i] == circuits[j]:
-            continue
 
-        # join circuits
-        circuits[i] += circuits[j]
-        for idx in circuits[i]:
-            circuits[idx] = circuits[i]
+def keep_closest(pairs: Pairs, k: int) -> Pairs:
+    d, i, j = next_batch(iter([pairs]), k)
+    return d[:k], i[:k], j[:k]
 
-    # now deduplicate circuits
-    unique_circuits: list[set[int]] = []
-    for v in circuits.values():
-        set_v = set(v)
-        if set_v not in unique_circuits:
-            unique_circuits.append(set_v)
 
-    sorted_circuit_sizes = sorted([len(v) for v in unique_circuits], reverse=True)
-    print(f"Sorted circuit sizes: {sorted_circuit_sizes}")
+def closest_pairs(coords: np.ndarray, k: int) -> Pairs:
+    # each block only has to hand over its own k best pairs
+    d, i, j = next_batch(box_pairs(coords), k)
+    return d[:k], i[:k], j[:k]
 
-    return sorted_circuit_sizes[0] * sorted_circuit_sizes[1] * sorted_circuit_sizes[2]
 
+# batches of pairs never grow beyond this (~25 MB for the three arrays)
+MAX_BATCH = 1 << 20
 
-def second(input: str | Path) -> float:
-    # col x row
-    boxes = parse_input(input)
-
-    # lets try to use references here to make my life easier later on (with less looped checks)
-    circuits: dict[int, list[int]] = {i: [i] for i in range(len(boxes))}
-
-    # calc the distance matrix and put them in a list for sorting
-    # this is a list of tuples with each tuple containing a tuple with the indeces and the distance
-    distances: list[tuple[float, tuple[int, int]]] = []
-    for i, b1 in enumerate(boxes):
-        for j, b2 in enumerate(boxes):
-            if i == j:
-                continue  # no need to compute
-            elif i > j:
-                continue  # already computed previously
-            else:
-                distances.append((Box.distance(b1, b2), (i, j)))
-    distances.sort(key=lambda x: x[0])
 
+def ascending_batches(
+    coords: np.ndarray, circuits: Circuits | None = None, batch_size: int = 1 << 16
+) -> Iterator[Pairs]:
+    # all pairs in ascending order, but only one batch is held at a time. every batch
+    # computes the distances again, the batch size doubles so that only O(log n) passes
+    # are needed, and memory depends on the number of pairs used, not on all of them.
+    # with circuits, pairs that are already joined when a batch starts are left out.
+    lower = -1
     while True:
-        # get smallest distance
-        _, (i, j) = distances[0]
-        distances.pop(0)
+        roots = circuits.roots() if circuits is not None else None
+        d, i, j = next_batch(box_pairs(coords, lower, roots), batch_size)
+        if len(d) == 0:
+            return
+        yield d, i, j
+
+        lower = int(d[-1])
+        batch_size = min(2 * batch_size, MAX_BATCH)
+
+
+def ascending_pairs(coords: np.ndarray) -> Iterator[tuple[int, tuple[int, int]]]:
+    for batch in ascending_batches(coords):
+        yield from iter_pairs(batch)
+
+
+# boxes grouped by grid cells of size radius, with the bounding box of each cell
+Grid = dict[tuple[int, int, int], tuple[np.ndarray, list[int], list[int]]]
+
+
+def build_grid(coords: np.ndarray, radius: int) -> Grid:
+    members: dict[tuple[int, int, int], list[int]] = defaultdict(list)
+    for i, cell in enumerate((coords // radius).tolist()):
+        members[tuple(cell)].append(i)
+
+    grid: Grid = {}
+    for cell, m in members.items():
+        own = np.array(m, dtype=np.int64)
+        low, high = coords[own].min(axis=0), coords[own].max(axis=0)
+        grid[cell] = own, low.tolist(), high.tolist()
+    return grid
+
+
+# all pairs with lower < squared distance <= upper. only the 27 cells around a box have
+# to be looked at, and cells that are completely below lower or above upper are skipped
+# based on their bounding boxes, without computing anything.
+def grid_pairs(
+    coords: np.ndarray,
+    grid: Grid,
+    lower: int,
+    upper: int,
+    roots: np.ndarray | None = None,
+) -> Iterator[Pairs]:
+    for cell, (own, low1, high1) in grid.items():
+        others: list[np.ndarray] = []
+        for offset in product(range(-1, 2), repeat=3):
+            other = (cell[0] + offset[0], cell[1] + offset[1], cell[2] + offset[2])
+            if other < cell or other not in grid:
+                continue  # every pair of cells only once
+
+            boxes, low2, high2 = grid[other]
+            bounds = list(zip(low1, high1, low2, high2))
+            closest = sum(max(0, l2 - h1, l1 - h2) ** 2 for l1, h1, l2, h2 in bounds)
+            furthest = sum(max(h2 - l1, h1 - l2) ** 2 for l1, h1, l2, h2 in bounds)
+            if closest > upper or furthest <= lower:
+                continue
+
+            # the cell itself goes first, as only there both boxes can be from own
+            if other == cell:
+                others.insert(0, boxes)
+            else:
+                others.append(boxes)
 
-        # check if they are in the same circuit
-        if circuits[i] == circuits[j]:
+        if not others:
             continue
+        shared = len(own) if others[0] is own else 0
+        joined = np.concatenate(others)
+        if roots is not None:
+            involved = roots[np.concatenate([own, joined])]
+            if (involved == involved[0]).all():
+                continue  # all of them are in the same circuit already
+
+        yield from block_pairs(
+            coords, own, joined, lower, upper, shared=shared, roots=roots
+        )
+
+
+# squared radius in which a typical box has `neighbours` others, measured on a sample
+# of boxes instead of assuming they are spread evenly over the bounding box
+def neighbour_radius(coords: np.ndarray, neighbours: int, samples: int = 64) -> int:
+    n = len(coords)
+    k = min(neighbours, n - 1)
+    picked = np.linspace(0, n - 1, min(samples, n)).astype(np.int64)
+    d = squared_distances(coords[picked], coords)
+    # index 0 is the box itself (distance 0)
+    kth = np.partition(d, k, axis=1)[:, k]
+    return int(np.median(kth))
+
+
+def nearby_batches(
+    coords: np.ndarray,
+    circuits: Circuits | None = None,
+    neighbours: int = 64,
+    batch_size: int = 1 << 16,
+) -> Iterator[Pairs]:
+    # same pairs in the same order as ascending_pairs, but only the ones within a radius are
+    # computed. once all of them are used up, the radius is doubled and the next shell is
+    # yielded. inside a shell the pairs come in batches, just like in ascending_batches.
+    if len(coords) < 2:
+        return
+
+    spans = (coords.max(axis=0) - coords.min(axis=0)).tolist()
+    max_distance = sum(s**2 for s in spans)
+
+    radius = max(1, math.isqrt(neighbour_radius(coords, neighbours)) + 1)
+
+    lower = -1
+    while lower < max_distance:
+        upper = radius**2
+        grid = build_grid(coords, radius)
+        while True:
+            roots = circuits.roots() if circuits is not None else None
+            pairs = grid_pairs(coords, grid, lower, upper, roots)
+            d, i, j = next_batch(pairs, batch_size)
+            yield d, i, j
+            if len(d) < batch_size:
+                break  # nothing was cut off, so the shell is done
+
+            lower = int(d[-1])
+            batch_size = min(2 * batch_size, MAX_BATCH)
+
+        lower = upper
+        radius *= 2
+
+
+def nearby_pairs(coords: np.ndarray) -> Iterator[tuple[int, tuple[int, int]]]:
+    for batch in nearby_batches(coords):
+        yield from iter_pairs(batch)
+
+
+# kruskal until everything is one circuit, returns the product of the x coordinates
+# of the last joined pair. the batches should come from the same circuits, so they
+# can leave out the pairs that are already joined.
+def join_all(coords: np.ndarray, circuits: Circuits, batches: Iterator[Pairs]) -> int:
+    for _, (i, j) in chain.from_iterable(map(iter_pairs, batches)):
+        if circuits.union(i, j) and circuits.circuit_size(i) == len(coords):
+            return int(coords[i, 0] * coords[j, 0])
+
+    raise ValueError("Boxes could not be joined into a single circuit")
 
-        # join circuits
-        circuits[i] += circuits[j]
-        for idx in circuits[i]:
-            circuits[idx] = circuits[i]
 
-        if len(circuits[i]) == len(boxes):
-            return boxes[i].x * boxes[j].x
+def first(input: str | Path, connections: int) -> int:
+    # col x row
+    coords = parse_input(input)
 
+    circuits = Circuits(len(coords))
 
-# first
-test_res = first(TEST_FIRST, 10)
-print(f"First (Test): {test_res}")
-assert test_res == 40
+    # only keep the closest pairs, no need to sort all of them
+    for _, (i, j) in iter_pairs(closest_pairs(coords, connections)):
+        # joining does nothing if they are already in the same circuit
+        circuits.union(i, j)
 
-t0 = perf_counter()
-prod_res = first(Path("./days/08/input/first"), 1000)
-print(f"First (Prod): {prod_res}. Took {perf_counter() - t0} seconds")
+    sorted_circuit_sizes = sorted(circuits.sizes(), reverse=True)
+    print(f"Sorted circuit sizes: {sorted_circuit_sizes}")
+
+    return sorted_circuit_sizes[0] * sorted_circuit_sizes[1] * sorted_circuit_sizes[2]
 
-# second
-test_res = second(TEST_FIRST)
-print(f"Second (Test): {test_res}")
-assert test_res == 25272
 
-t0 = perf_counter()
-prod_res = second(Path("./days/08/input/first"))
-print(f"Second (Prod): {prod_res}. Took {perf_counter() - t0} seconds")
+def second(input: str | Path) -> int:
+    coords = parse_input(input)
+    circuits = Circuits(len(coords))
+    return join_all(coords, circuits, ascending_batches(coords, circuits))
+
+
+def first_grid(input: str | Path, connections: int) -> int:
+    coords = parse_input(input)
+
+    circuits = Circuits(len(coords))
+    for _, (i, j) in islice(nearby_pairs(coords), connections):
+        circuits.union(i, j)
+
+    sizes = sorted(circuits.sizes(), reverse=True)
+    return sizes[0] * sizes[1] * sizes[2]
+
+
+def second_grid(input: str | Path) -> int:
+    coords = parse_input(input)
+    circuits = Circuits(len(coords))
+    return join_all(coords, circuits, nearby_batches(coords, circuits))
+
+
+# the last edge kruskal adds is the longest edge of the minimum spanning tree,
+# so dense prim works as well. this only keeps one best distance per box, instead
+# of all pairs. squared distances are enough for ordering and stay exact integers.
+# edges are compared by (distance, lower index, higher index), same as in kruskal,
+# which makes the tree unique even with equal distances.
+def second_prim(input: str | Path) -> int:
+    coords = parse_input(input)
+    n = len(coords)
+    if n < 2:
+        raise ValueError("Boxes could not be joined into a single circuit")
+
+    boxes = np.arange(n, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+    # best edge of every box into the tree, as (distance, lower, higher)
+    best = np.full(n, np.iinfo(np.int64).max, dtype=np.int64)
+    best_lo = np.full(n, n, dtype=np.int64)
+    best_hi = np.full(n, n, dtype=np.int64)
+
+    current = 0
+    longest: tuple[int, int, int] = (-1, 0, 0)
+    for _ in range(n - 1):
+        in_tree[current] = True
+
+        distances = squared_distances(coords[current : current + 1], coords)[0]
+        lo = np.minimum(boxes, current)
+        hi = np.maximum(boxes, current)
+        closer = (distances < best) | (
+            (distances == best) & ((lo < best_lo) | ((lo == best_lo) & (hi < best_hi)))
+        )
+        closer &= ~in_tree
+        best[closer] = distances[closer]
+        best_lo[closer] = lo[closer]
+        best_hi[closer] = hi[closer]
+
+        # smallest (distance, lower, higher) of all boxes outside of the tree
+        outside = np.where(in_tree, np.iinfo(np.int64).max, best)
+        candidates = np.flatnonzero(outside == outside.min())
+        if len(candidates) > 1:
+            order = np.lexsort((best_hi[candidates], best_lo[candidates]))
+            candidates = candidates[order]
+        current = int(candidates[0])
+
+        edge = (int(best[current]), int(best_lo[current]), int(best_hi[current]))
+        longest = max(longest, edge)
+
+    _, i, j = longest
+    return int(coords[i, 0] * coords[j, 0])
+
+
+# one tile of the upper triangle, computed in a worker process. the coordinates are
+# read from shared memory and only the k best pairs of the tile are sent back.
+def tile_closest(
+    shm_name: str, n: int, rows: tuple[int, int], cols: tuple[int, int], k: int
+) -> Pairs:
+    # the parent owns the segment, so the worker must not register it for cleanup
+    shm = shared_memory.SharedMemory(name=shm_name, track=False)
+    try:
+        coords = np.ndarray((n, 3), dtype=np.int64, buffer=shm.buf)
+        (r0, r1), (c0, c1) = rows, cols
+
+        if r0 == c0:
+            # on the diagonal only the part right of each strip of rows is computed
+            strips = [
+                block_pairs(
+                    coords,
+                    np.arange(a, min(a + 64, r1), dtype=np.int64),
+                    np.arange(a, c1, dtype=np.int64),
+                    shared=c1 - a,
+                )
+                for a in range(r0, r1, 64)
+            ]
+            blocks = chain.from_iterable(strips)
+        else:
+            own = np.arange(r0, r1, dtype=np.int64)
+            blocks = block_pairs(coords, own, np.arange(c0, c1, dtype=np.int64))
+
+        d, i, j = next_batch(blocks, k)
+        del coords  # the shared buffer can only be closed without views on it
+        return d[:k], i[:k], j[:k]
+    finally:
+        shm.close()
+
+
+def first_parallel(
+    input: str | Path,
+    connections: int,
+    workers: int | None = None,
+    tile_size: int = 4096,
+) -> int:
+    coords = parse_input(input)
+    n = len(coords)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(coords.nbytes, 1))
+    try:
+        shared = np.ndarray(coords.shape, dtype=np.int64, buffer=shm.buf)
+        shared[:] = coords
+        del shared
+
+        # only tiles on or above the diagonal, the ones below hold the same pairs
+        tiles = [
+            ((r, min(r + tile_size, n)), (c, min(c + tile_size, n)))
+            for r in range(0, n, tile_size)
+            for c in range(r, n, tile_size)
+        ]
+
+        best = concat_pairs([])
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(tile_closest, shm.name, n, rows, cols, connections)
+                for rows, cols in tiles
+            ]
+            for future in futures:
+                best = keep_closest(concat_pairs([best, future.result()]), connections)
+    finally:
+        shm.close()
+        shm.unlink()
+
+    circuits = Circuits(n)
+    for _, (i, j) in iter_pairs(best):
+        circuits.union(i, j)
+
+    sizes = sorted(circuits.sizes(), reverse=True)
+    return sizes[0] * sizes[1] * sizes[2]
+
+
+# workers may import this file again, so only run the challenges in the main process
+if __name__ == "__main__":
+    # first
+    test_res = first(TEST_FIRST, 10)
+    print(f"First (Test): {test_res}")
+    assert test_res == 40
+
+    t0 = perf_counter()
+    prod_res = first(Path("./days/08/input/first"), 1000)
+    print(f"First (Prod): {prod_res}. Took {perf_counter() - t0} seconds")
+
+    assert first_parallel(TEST_FIRST, 10, tile_size=4) == 40
+    t0 = perf_counter()
+    parallel_res = first_parallel(Path("./days/08/input/first"), 1000)
+    print(f"First (Prod, parallel): {parallel_res}. Took {perf_counter() - t0} seconds")
+    assert parallel_res == prod_res
+
+    assert first_grid(TEST_FIRST, 10) == 40
+    t0 = perf_counter()
+    grid_res = first_grid(Path("./days/08/input/first"), 1000)
+    print(f"First (Prod, grid): {grid_res}. Took {perf_counter() - t0} seconds")
+    assert grid_res == prod_res
+
+    # second
+    test_res = second(TEST_FIRST)
+    print(f"Second (Test): {test_res}")
+    assert test_res == 25272
+
+    t0 = perf_counter()
+    prod_res = second(Path("./days/08/input/first"))
+    print(f"Second (Prod): {prod_res}. Took {perf_counter() - t0} seconds")
+
+    assert second_grid(TEST_FIRST) == 25272
+    t0 = perf_counter()
+    grid_res = second_grid(Path("./days/08/input/first"))
+    print(f"Second (Prod, grid): {grid_res}. Took {perf_counter() - t0} seconds")
+    assert grid_res == prod_res
+
+    assert second_prim(TEST_FIRST) == 25272
+    t0 = perf_counter()
+    prim_res = second_prim(Path("./days/08/input/first"))
+    print(f"Second (Prod, prim): {prim_res}. Took {perf_counter() - t0} seconds")
+    assert prim_res == prod_res